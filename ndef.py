@@ -34,6 +34,8 @@ ndef_uri_prepends = {
 
 # --- NDEF Parser Class ---
 class Ndef:
+    __slots__ = ("data", "output")
+
     def __init__(self, data: bytes):
         self.data = data  # Assumed contiguous memory holding NDEF TLV data
         self.output = ""
@@ -28,6 +28,9 @@ opal_usages = [
     "Unknown usage"
 ]
 
+# Epoca dei campi 'days'/'minutes' dell'Opal card
+OPAL_EPOCH = datetime(1980, 1, 1)
+
 def opal_days_minutes_to_datetime(days: int, minutes: int) -> datetime:
     """
     Converte il campo 'days' e 'minutes' dell'Opal card in una data e ora.
@@ -35,9 +38,7 @@ def opal_days_minutes_to_datetime(days: int, minutes: int) -> datetime:
     e 'minutes' il numero di minuti trascorsi dall'inizio del giorno.
     """
     # Partenza: 1980-01-01
-    base = datetime(1980, 1, 1)
-    dt = base + timedelta(days=days, minutes=minutes)
-    return dt
+    return OPAL_EPOCH + timedelta(days=days, minutes=minutes)
 
 def parse_opal(file_data: bytes) -> str:
     if len(file_data) < OPAL_FILE_SIZE:
@@ -105,19 +106,16 @@ def parse_opal(file_data: bytes) -> str:
     dt = opal_days_minutes_to_datetime(days_field, minutes_field)
     timestamp_str = dt.strftime("%Y-%m-%d at %H:%M:%S")
 
-    # Componi l'output
-    output_lines = []
-    output_lines.append(f"\e#Opal: ${sign}{balance_dollars}.{balance_cents:02d}")
-    output_lines.append(f"No.: 3085 22{serial2:02d} {serial3:04d} {serial4:03d}{check_digit:1d}")
-    output_lines.append(f"{mode_str}, {usage_str}")
-    output_lines.append(timestamp_str)
-    output_lines.append(f"Weekly journeys: {weekly_journeys}, Txn #{txn_number}")
-    if auto_topup:
-        output_lines.append("Auto-topup enabled")
-    if blocked:
-        output_lines.append("Card blocked")
-    
-    return "\n".join(output_lines)
+    # Componi l'output: intestazione fissa, poi eventuali righe opzionali
+    output = (
+        f"\\e#Opal: ${sign}{balance_dollars}.{balance_cents:02d}\n"
+        f"No.: 3085 22{serial2:02d} {serial3:04d} {serial4:03d}{check_digit:1d}\n"
+        f"{mode_str}, {usage_str}\n"
+        f"{timestamp_str}\n"
+        f"Weekly journeys: {weekly_journeys}, Txn #{txn_number}"
+    )
+    extras = ("\nAuto-topup enabled" if auto_topup else "") + ("\nCard blocked" if blocked else "")
+    return output + extras
 
 def main():
     if len(sys.argv) != 2:
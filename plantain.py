@@ -124,9 +124,6 @@ def plantain_parse(card_data: bytes, card_type: str) -> str:
     if len(uid) not in (4, 7):
         return "Error: invalid UID length."
     card_number_bytes = uid[::-1]  # reverse the UID bytes
-    card_number = int.from_bytes(card_number_bytes, byteorder='big')
-    # Format card number as hex groups (es. "3078" in "9643 3078 ...")
-    card_str = f"{card_number:X}"
     # For simplicity, non applichiamo formattazioni complicate, mostriamo l'UID in reverse order.
     output += "Number: " + " ".join(f"{b:02X}" for b in card_number_bytes) + "\n"
     
@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
 import sys
+import struct
+from collections import namedtuple
 from datetime import datetime, timedelta
 
 OPAL_FILE_SIZE = 16
+# Il record da 16 byte letto come due parole little-endian da 64 bit (bassa, alta)
+OPAL_RECORD = struct.Struct("<QQ")
+
+# Campi decodificati di un record Opal (mode e usage già corretti per il "Manly Ferry")
+OpalRecord = namedtuple("OpalRecord", [
+    "serial", "check_digit", "blocked", "txn_number", "balance", "days",
+    "minutes", "mode", "usage", "auto_topup", "weekly_journeys",
+])
 
 # Opal card bitfield definitions (per un intero a 128 bit, little-endian):
 #   serial: bits 0-31
@@ -20,15 +30,15 @@ OPAL_FILE_SIZE = 16
 #
 # Le nostre conversioni considerano solo i campi rilevanti per l’output.
 
-opal_modes = [
+opal_modes = (
     "Rail / Metro",
     "Ferry / Light Rail",
     "Bus",
     "Unknown mode",
     "Manly Ferry"
-]
+)
 
-opal_usages = [
+opal_usages = (
     "New / Unused",
     "Tap on: new journey",
     "Tap on: transfer from same mode",
@@ -40,87 +50,111 @@ opal_usages = [
     "Tap off: reversal",
     "Tap on: rejected",
     "Unknown usage"
-]
+)
+
+# Tabelle complete per mode (3 bit) e usage (4 bit): i valori fuori tabella sono già "Unknown"
+OPAL_MODE_NAMES = opal_modes + ("Unknown mode",) * (8 - len(opal_modes))
+OPAL_USAGE_NAMES = opal_usages + ("Unknown usage",) * (16 - len(opal_usages))
+
+# Epoca dei campi 'days'/'minutes' dell'Opal card
+OPAL_EPOCH = datetime(1980, 1, 1)
 
 def opal_days_minutes_to_datetime(days: int, minutes: int) -> datetime:
     """Converte i campi 'days' e 'minutes' in una data, partendo dal 1980-01-01."""
-    base = datetime(1980, 1, 1)
-    return base + timedelta(days=days, minutes=minutes)
+    return OPAL_EPOCH + timedelta(days=days, minutes=minutes)
 
-def parse_opal(file_data: bytes) -> str:
-    if len(file_data) < OPAL_FILE_SIZE:
-        return "Error: file too short."
-    
-    # Legge 16 byte in little-endian come intero a 128 bit
-    raw = int.from_bytes(file_data[:OPAL_FILE_SIZE], byteorder='little', signed=False)
-    
-    serial      = raw & ((1 << 32) - 1)
-    check_digit = (raw >> 32) & 0xF
-    if check_digit > 9:
-        return "Error: invalid check digit."
-    blocked     = (raw >> 36) & 0x1
-    txn_number  = (raw >> 37) & ((1 << 16) - 1)
-    balance_raw = (raw >> 53) & ((1 << 21) - 1)
+def decode_opal_record(lo: int, hi: int) -> OpalRecord:
+    """Decodifica i bitfield di un record Opal dalle sue due parole da 64 bit (lo, hi)."""
+    serial      = lo & ((1 << 32) - 1)
+    check_digit = (lo >> 32) & 0xF
+    blocked     = (lo >> 36) & 0x1
+    txn_number  = (lo >> 37) & ((1 << 16) - 1)
+    # balance (bit 53-73) è a cavallo delle due parole
+    balance_raw = ((lo >> 53) | (hi << 11)) & ((1 << 21) - 1)
     # Sign extend 21-bit balance
     if balance_raw & (1 << 20):
         balance = balance_raw - (1 << 21)
     else:
         balance = balance_raw
-    days_field    = (raw >> 74) & ((1 << 15) - 1)
-    minutes_field = (raw >> 89) & ((1 << 11) - 1)
-    mode_field    = (raw >> 100) & 0x7
-    usage_field   = (raw >> 103) & 0xF
-    auto_topup    = (raw >> 107) & 0x1
-    weekly_journeys = (raw >> 108) & 0xF
+    days_field    = (hi >> (74 - 64)) & ((1 << 15) - 1)
+    minutes_field = (hi >> (89 - 64)) & ((1 << 11) - 1)
+    mode_field    = (hi >> (100 - 64)) & 0x7
+    usage_field   = (hi >> (103 - 64)) & 0xF
+    auto_topup    = (hi >> (107 - 64)) & 0x1
+    weekly_journeys = (hi >> (108 - 64)) & 0xF
     # checksum field non viene usato nel parser
+
+    # Regola per "Manly Ferry": se usage_field è tra 4 e 6, mode è 4 e usage = usage_field - 3.
+    is_manly_ferry = (usage_field >= 4 and usage_field <= 6)
+    if is_manly_ferry:
+        mode = 4
+        usage = usage_field - 3
+    else:
+        mode = mode_field
+        usage = usage_field
+
+    return OpalRecord(serial, check_digit, blocked, txn_number, balance, days_field,
+                      minutes_field, mode, usage, auto_topup, weekly_journeys)
+
+def parse_opal_batch(records: bytes) -> list:
+    """
+    Decodifica una sequenza di record Opal concatenati (N * OPAL_FILE_SIZE byte),
+    ad esempio per strumenti che scansionano molti dump. Restituisce una lista di
+    OpalRecord, con None al posto dei record scartati da parse_opal (check digit > 9),
+    così che le posizioni corrispondano ai record in ingresso; la formattazione
+    dell'output resta compito di parse_opal.
+    """
+    decode = decode_opal_record
+    results = []
+    for lo, hi in OPAL_RECORD.iter_unpack(records):
+        record = decode(lo, hi)
+        results.append(record if record.check_digit <= 9 else None)
+    return results
+
+def parse_opal(file_data: bytes) -> str:
+    if len(file_data) < OPAL_FILE_SIZE:
+        return "Error: file too short."
+    
+    # Legge i 16 byte come due parole da 64 bit: i bit 0-63 stanno in lo, i bit 64-127 in hi
+    record = decode_opal_record(*OPAL_RECORD.unpack_from(file_data))
+    check_digit = record.check_digit
+    if check_digit > 9:
+        return "Error: invalid check digit."
+    serial = record.serial
+    balance = record.balance
+    mode = record.mode
+    usage = record.usage
     
     is_negative = balance < 0
     sign_str = "-" if is_negative else ""
-    bal_abs = abs(balance)
-    balance_dollars = bal_abs // 100
-    balance_cents   = bal_abs % 100
+    bal_units, bal_cents = divmod(abs(balance), 100)
 
     # Formatta il numero della carta:
     # Serial number in Opal card è composto da:
     #   serial2 = serial // 10000000
     #   serial3 = (serial // 1000) % 10000
     #   serial4 = serial % 1000
-    serial2 = serial // 10000000
-    serial3 = (serial // 1000) % 10000
-    serial4 = serial % 1000
+    # (due divmod che condividono il quoziente intermedio)
+    q, serial4 = divmod(serial, 1000)
+    serial2, serial3 = divmod(q, 10000)
     card_number_str = f"3085 22{serial2:02d} {serial3:04d} {serial4:03d}{check_digit:1d}"
-    
-    # Regola per "Manly Ferry": se usage_field è tra 4 e 6, mode è 4 e usage = usage_field - 3.
-    is_manly_ferry = (usage_field >= 4 and usage_field <= 6)
-    if is_manly_ferry:
-        mode = 4
-        usage = usage_field - 3
-    else:
-        mode = mode_field
-        usage = usage_field
 
-    if mode > 4:
-        mode_str = "Unknown mode"
-    else:
-        mode_str = opal_modes[mode]
-    if usage > 10:
-        usage_str = "Unknown usage"
-    else:
-        usage_str = opal_usages[usage]
+    mode_str = OPAL_MODE_NAMES[mode]
+    usage_str = OPAL_USAGE_NAMES[usage]
     
-    dt = opal_days_minutes_to_datetime(days_field, minutes_field)
+    dt = opal_days_minutes_to_datetime(record.days, record.minutes)
     timestamp_str = dt.strftime("%Y-%m-%d at %H:%M:%S")
     
     output_lines = [
-        f"Opal: ${sign_str}{balance_dollars}.{balance_cents:02d}",
+        f"Opal: ${sign_str}{bal_units}.{bal_cents:02d}",
         f"No.: {card_number_str}",
         f"{mode_str}, {usage_str}",
         timestamp_str,
-        f"Weekly journeys: {weekly_journeys}, Txn #{txn_number}"
+        f"Weekly journeys: {record.weekly_journeys}, Txn #{record.txn_number}"
     ]
-    if auto_topup:
+    if record.auto_topup:
         output_lines.append("Auto-topup enabled")
-    if blocked:
+    if record.blocked:
         output_lines.append("Card blocked")
     
     return "\n".join(output_lines)
@@ -2,10 +2,48 @@
 import sys
 import struct
 from datetime import datetime, timedelta
+from operator import attrgetter
 
 # Costanti
 MAX_TRIPS = 10
 MAX_BLOCKS = 64
+BLOCK_SIZE = 16
+
+# Blocchi che contengono i viaggi: da 40 a 52, esclusi i trailer 43, 47 e 51
+TRIP_BLOCKS = (40, 41, 42, 44, 45, 46, 48, 49, 50, 52)
+# Un blocco viaggio vuoto è tutto 0xFF
+EMPTY_TRIP_BLOCK = b'\xFF' * BLOCK_SIZE
+
+# Layout di un blocco viaggio (little-endian): transaction number (byte 0),
+# journey number (byte 2), flag (byte 7), route (byte 8-11), costo (byte 13)
+TRIP_LAYOUT = struct.Struct("<HHxxxB4sxH")
+# Il timestamp parte dal byte 3 e si sovrappone al journey number
+TRIP_TIMESTAMP = struct.Struct("<xxxI")
+# Campo little-endian da 2 byte, letto direttamente dal dump senza slicing
+U16LE = struct.Struct("<H")
+
+# Tipi di concessione indicizzati dalla token, come nel C originale ("Unknown" nei buchi)
+CONCESSION_TYPES = (
+    "Pre-issue", "Standard Fare", "Student", "Unknown", "Tertiary", "Unknown",
+    "Seniors", "Health Care", "Unknown", "Unknown", "Unknown", "Unknown", "Unknown", "Unknown",
+    "PTA Staff", "Pensioner", "Free Travel"
+)
+
+# Epoca dei timestamp dei viaggi: 2010-01-01 più 24 ore (1440 minuti)
+SMARTRIDER_EPOCH = datetime(2010, 1, 2)
+
+# Formati dell'output: intestazione e righe della cronologia (con e senza costo)
+SMARTRIDER_HEADER = (
+    "SmartRider\n"
+    "Balance: $%d.%02d\n"
+    "Concession: %s\n"
+    "Serial: %s\n"
+    "Total Cost: $%d.%02d\n"
+    "Auto-Load: $%d.%02d/$%d.%02d\n"
+    "Tag On/Off History"
+)
+TRIP_LINE_COST = "%s %s $%d.%02d %s"
+TRIP_LINE_FREE = "%s %s %s"
 
 # Chiavi standard (3 chiavi da 6 byte ciascuna) per l'autenticazione
 STANDARD_KEYS = [
@@ -14,54 +52,30 @@ STANDARD_KEYS = [
     bytes([0x19, 0x19, 0x53, 0x98, 0xE3, 0x2F])
 ]
 
-# Funzione per leggere un blocco (16 byte) dal dump
-def get_block(card_data: bytes, block_num: int) -> bytes:
-    start = block_num * 16
-    return card_data[start:start+16]
-
-# Funzione per leggere un intero little-endian dai byte
-def get_number_le(data: bytes, start: int, length: int) -> int:
-    return int.from_bytes(data[start:start+length], byteorder='little')
-
-# Funzione per leggere un intero big-endian dai byte
-def get_number_be(data: bytes, start: int, length: int) -> int:
-    return int.from_bytes(data[start:start+length], byteorder='big')
-
-# Funzione per autenticare un settore e leggere un blocco
-def authenticate_and_read(nfc_data: bytes, sector: int, key: bytes) -> bytes:
-    # In questa conversione ipotizziamo che il dump sia già letto e le chiavi siano usate per
-    # "verificare" che i primi 6 byte del trailer del settore corrispondano alla chiave attesa.
-    # Il trailer del settore si trova nel blocco: (sector * 4 + 3)
-    trailer = get_block(nfc_data, sector * 4 + 3)
-    if trailer[0:6] != key:
-        raise ValueError(f"Authentication failed for sector {sector}")
-    # Restituisce il blocco letto (simulato)
-    return trailer
+# Offset dei trailer (blocco sector * 4 + 3) dei settori 0, 6 e 12, come nel C originale,
+# e chiavi attese nello stesso ordine
+VERIFY_KEY_OFFSETS = tuple((sector * 4 + 3) * BLOCK_SIZE for sector in (0, 6, 12))
+VERIFY_KEYS = tuple(STANDARD_KEYS)
 
 # Funzione di verifica della SmartRider card
 def smartrider_verify(nfc_data: bytes) -> bool:
-    # Per ogni chiave (3 in totale), verifica che il blocco letto corrisponda alla chiave attesa.
-    try:
-        for i in range(3):
-            sector = i * 6  # come nel C originale
-            # Scegliamo la chiave A per i settori, per il settore 0 usiamo STANDARD_KEYS[0],
-            # per gli altri STANDARD_KEYS[1] e STANDARD_KEYS[2] (per i settori > 0)
-            key = STANDARD_KEYS[0] if i == 0 else STANDARD_KEYS[1] if i == 1 else STANDARD_KEYS[2]
-            authenticate_and_read(nfc_data, sector, key)
-        return True
-    except Exception as e:
-        return False
+    # In questa conversione il dump è già letto: le chiavi vengono "verificate" controllando
+    # che i primi 6 byte del trailer dei settori 0, 6 e 12 corrispondano a STANDARD_KEYS.
+    # I tre trailer vengono confrontati in un'unica operazione.
+    return tuple(nfc_data[off:off + 6] for off in VERIFY_KEY_OFFSETS) == VERIFY_KEYS
 
 # Funzione per leggere la SmartRider card
 def smartrider_read(nfc_data: bytes) -> bytes:
     # In questa conversione assumiamo che nfc_data contenga già il dump dei dati.
     # Se il dump non è sufficientemente lungo, solleviamo un'eccezione.
-    if len(nfc_data) < MAX_BLOCKS * 16:
+    if len(nfc_data) < MAX_BLOCKS * BLOCK_SIZE:
         raise ValueError("Dump too short")
     return nfc_data
 
 # Struttura dati per un viaggio
 class TripData:
+    __slots__ = ("timestamp", "cost", "transaction_number", "journey_number", "route", "tap_on", "block")
+
     def __init__(self):
         self.timestamp = 0
         self.cost = 0
@@ -73,6 +87,9 @@ class TripData:
 
 # Struttura dati per SmartRider
 class SmartRiderData:
+    __slots__ = ("balance", "issued_days", "expiry_days", "purchase_cost", "auto_load_threshold",
+                 "auto_load_value", "card_serial_number", "token", "trips", "trip_count")
+
     def __init__(self):
         self.balance = 0
         self.issued_days = 0
@@ -88,38 +105,30 @@ class SmartRiderData:
 # Funzione per parsare i dati di un viaggio da un blocco
 def parse_trip_data(block_data: bytes, block_number: int) -> TripData:
     trip = TripData()
+    # Tutti i campi a offset fisso vengono decodificati con una sola chiamata
+    txn, journey, flags, route, cost = TRIP_LAYOUT.unpack_from(block_data)
     # Il timestamp è a partire dal byte 3 (4 byte, little-endian)
-    trip.timestamp = get_number_le(block_data, 3, 4)
+    trip.timestamp = TRIP_TIMESTAMP.unpack_from(block_data)[0]
     # Il flag tap_on è nel byte 7, bit 4 (0x10)
-    trip.tap_on = (block_data[7] & 0x10) == 0x10
+    trip.tap_on = (flags & 0x10) == 0x10
     # La route: 4 byte a partire dal byte 8, convertiti in ASCII
-    trip.route = block_data[8:12].decode('ascii', errors='replace')
-    # Il costo: 2 byte a partire dal byte 13 (little-endian)
-    trip.cost = get_number_le(block_data, 13, 2)
-    # Transaction number: 2 byte a partire dal byte 0
-    trip.transaction_number = get_number_le(block_data, 0, 2)
-    # Journey number: 2 byte a partire dal byte 2
-    trip.journey_number = get_number_le(block_data, 2, 2)
+    trip.route = route.decode('ascii', errors='replace')
+    trip.cost = cost
+    trip.transaction_number = txn
+    trip.journey_number = journey
     trip.block = block_number
     return trip
 
 # Funzione per convertire un timestamp (in minuti) in una data formattata
 def calculate_date(timestamp: int) -> str:
-    # Aggiungiamo 24 ore (1440 minuti) come offset e partiamo dal 2010-01-01
-    base = datetime(2010, 1, 1)
-    dt = base + timedelta(minutes=timestamp + 1440)
+    # I minuti partono dal 2010-01-01 con un offset di 24 ore, già incluso in SMARTRIDER_EPOCH
+    dt = SMARTRIDER_EPOCH + timedelta(minutes=timestamp)
     return dt.strftime("%d.%m.%Y %H:%M")
 
 # Funzione per ottenere la concessione (concession type) dalla token
 def get_concession_type(token: int) -> str:
-    # Tabella di esempio, come nel C originale
-    concession_types = [
-        "Pre-issue", "Standard Fare", "Student", None, "Tertiary", None,
-        "Seniors", "Health Care", None, None, None, None, None, None,
-        "PTA Staff", "Pensioner", "Free Travel"
-    ]
-    if 0 <= token < len(concession_types) and concession_types[token]:
-        return concession_types[token]
+    if 0 <= token < len(CONCESSION_TYPES):
+        return CONCESSION_TYPES[token]
     return "Unknown"
 
 # Funzione per parsare il dump SmartRider
@@ -127,13 +136,12 @@ def smartrider_parse(nfc_data: bytes) -> str:
     # In questa conversione, utilizziamo la struttura SmartRiderData per accumulare i dati.
     sr_data = SmartRiderData()
     
-    # Verifica che il dump sia sufficientemente lungo (assumiamo MAX_BLOCKS * 16 byte)
-    if len(nfc_data) < MAX_BLOCKS * 16:
+    # Verifica che il dump sia sufficientemente lungo (assumiamo MAX_BLOCKS * BLOCK_SIZE byte)
+    if len(nfc_data) < MAX_BLOCKS * BLOCK_SIZE:
         return "Error: dump too short."
     
     # Verifica la chiave: il blocco trailer del settore 0 (blocco 3) deve contenere STANDARD_KEYS[0]
-    trailer0 = get_block(nfc_data, 3)
-    if trailer0[0:6] != STANDARD_KEYS[0]:
+    if nfc_data[3 * BLOCK_SIZE:3 * BLOCK_SIZE + 6] != STANDARD_KEYS[0]:
         return "Error: Key verification failed for sector 0."
     
     # Alcuni blocchi "required" (da un array statico) devono essere letti; in Python verifichiamo la lunghezza
@@ -143,36 +151,33 @@ def smartrider_parse(nfc_data: bytes) -> str:
             return f"Error: required block {blk} out of range."
         # Simuliamo che il blocco sia letto se il dump ha i dati necessari.
     
-    # Estrai dati da specifici blocchi
+    # Estrai dati da specifici blocchi, leggendo i campi direttamente dal dump
+    read_u16 = U16LE.unpack_from
     # Balance: dal blocco 14, a partire dal byte 7 (2 byte, little-endian)
-    block14 = get_block(nfc_data, 14)
-    sr_data.balance = get_number_le(block14, 7, 2)
-    # Issued and expiry days: dal blocco 4, a partire dai byte 16 e 18 (2 byte ciascuno)
-    block4 = get_block(nfc_data, 4)
-    sr_data.issued_days = get_number_le(block4, 16, 2)
-    sr_data.expiry_days = get_number_le(block4, 18, 2)
+    sr_data.balance = read_u16(nfc_data, 14 * BLOCK_SIZE + 7)[0]
+    # Issued and expiry days: dal blocco 4, a partire dai byte 16 e 18 (2 byte ciascuno).
+    # Come nel C originale gli offset proseguono oltre il blocco 4, nel blocco 5.
+    sr_data.issued_days = read_u16(nfc_data, 4 * BLOCK_SIZE + 16)[0]
+    sr_data.expiry_days = read_u16(nfc_data, 4 * BLOCK_SIZE + 18)[0]
     # Purchase cost: dal blocco 0, a partire dal byte 14 (2 byte, little-endian)
-    block0 = get_block(nfc_data, 0)
-    sr_data.purchase_cost = get_number_le(block0, 14, 2)
+    sr_data.purchase_cost = read_u16(nfc_data, 0 * BLOCK_SIZE + 14)[0]
     # Auto-load threshold e value: dal blocco 4, a partire dai byte 20 e 22
-    sr_data.auto_load_threshold = get_number_le(block4, 20, 2)
-    sr_data.auto_load_value = get_number_le(block4, 22, 2)
+    sr_data.auto_load_threshold = read_u16(nfc_data, 4 * BLOCK_SIZE + 20)[0]
+    sr_data.auto_load_value = read_u16(nfc_data, 4 * BLOCK_SIZE + 22)[0]
     # Token: dal blocco 5, byte 8
-    block5 = get_block(nfc_data, 5)
-    sr_data.token = block5[8]
+    sr_data.token = nfc_data[5 * BLOCK_SIZE + 8]
     # Card serial number: dal blocco 1, bytes 6-10, convertito in esadecimale (11 caratteri)
-    block1 = get_block(nfc_data, 1)
-    sr_data.card_serial_number = block1[6:11].hex().upper()
+    sr_data.card_serial_number = nfc_data[1 * BLOCK_SIZE + 6:1 * BLOCK_SIZE + 11].hex().upper()
     
-    # Leggi i viaggi da blocchi 40 a 52, saltando 43, 47 e 51
+    # Leggi i viaggi dai blocchi TRIP_BLOCKS
     sr_data.trips = []
-    for block_number in range(40, 53):
-        if block_number in (43, 47, 51):
-            continue
+    # I blocchi vengono letti tramite memoryview, senza copiare il dump
+    view = memoryview(nfc_data)
+    for block_number in TRIP_BLOCKS:
         # Assumiamo che il blocco sia "letto" (il dump deve contenere 16 byte per ciascun blocco)
-        block_data = get_block(nfc_data, block_number)
+        block_data = view[block_number * BLOCK_SIZE:(block_number + 1) * BLOCK_SIZE]
         # Se il blocco non è pieno di 0xFF, consideralo valido
-        if block_data == b'\xFF' * 16:
+        if block_data == EMPTY_TRIP_BLOCK:
             continue
         trip = parse_trip_data(block_data, block_number)
         sr_data.trips.append(trip)
@@ -180,28 +185,27 @@ def smartrider_parse(nfc_data: bytes) -> str:
             break
     
     # Ordina i viaggi per timestamp decrescente
-    sr_data.trips.sort(key=lambda t: t.timestamp, reverse=True)
+    sr_data.trips.sort(key=attrgetter("timestamp"), reverse=True)
     
     # Costruisci l'output
-    output_lines = []
-    output_lines.append("SmartRider")
-    output_lines.append(f"Balance: ${sr_data.balance // 100}.{sr_data.balance % 100:02d}")
-    output_lines.append(f"Concession: {get_concession_type(sr_data.token)}")
     serial = sr_data.card_serial_number
     if serial.startswith("00"):
         serial = "SR0" + serial[2:]
-    output_lines.append(f"Serial: {serial}")
-    output_lines.append(f"Total Cost: ${sr_data.purchase_cost // 100}.{sr_data.purchase_cost % 100:02d}")
-    output_lines.append(f"Auto-Load: ${sr_data.auto_load_threshold // 100}.{sr_data.auto_load_threshold % 100:02d}/"
-                        f"${sr_data.auto_load_value // 100}.{sr_data.auto_load_value % 100:02d}")
-    output_lines.append("Tag On/Off History")
+    output_lines = [SMARTRIDER_HEADER % (
+        divmod(sr_data.balance, 100)
+        + (get_concession_type(sr_data.token), serial)
+        + divmod(sr_data.purchase_cost, 100)
+        + divmod(sr_data.auto_load_threshold, 100)
+        + divmod(sr_data.auto_load_value, 100)
+    )]
     for trip in sr_data.trips:
         date_str = calculate_date(trip.timestamp)
-        cost = trip.cost
-        if cost > 0:
-            output_lines.append(f"{date_str} {'+' if trip.tap_on else '-'} ${cost // 100}.{cost % 100:02d} {trip.route}")
+        sign = "-+"[trip.tap_on]
+        if trip.cost > 0:
+            dollars, cents = divmod(trip.cost, 100)
+            output_lines.append(TRIP_LINE_COST % (date_str, sign, dollars, cents, trip.route))
         else:
-            output_lines.append(f"{date_str} {'+' if trip.tap_on else '-'} {trip.route}")
+            output_lines.append(TRIP_LINE_FREE % (date_str, sign, trip.route))
     
     return "\n".join(output_lines)
 
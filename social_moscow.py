@@ -1,62 +1,70 @@
 #!/usr/bin/env python3
 import sys
 import struct
+from types import MappingProxyType
+from collections import namedtuple
 
 UID_LEN = 4
 MAX_BLOCKS = 64  # Numero massimo di blocchi
-# Funzione per leggere un blocco (16 byte) dal dump
+KEY_LENGTH = 6
+KEY_ENTRY_SIZE = 2 * KEY_LENGTH  # chiave A + chiave B per settore nei blob delle chiavi
+DATA_SECTOR = 15  # settore dati, uguale per 1K e 4K
+
+# Layout del blocco 60: codice (24 bit, nei 3 byte bassi del primo u32), regione,
+# numero (40 bit, byte alto + u32), byte di controllo, anno, mese e i due byte finali della validità
+BLOCK60_LAYOUT = struct.Struct(">IBBIBBBBB")
+# Layout del blocco 21: OMC number a 64 bit a partire dal byte 1
+BLOCK21_LAYOUT = struct.Struct(">xQ")
+
+# Funzione per leggere un blocco (16 byte) dal dump (senza copia se card_data è un memoryview)
 def get_block(card_data: bytes, block_num: int) -> bytes:
     start = block_num * 16
     return card_data[start:start+16]
 
-# Funzione per leggere un intero da un blocco (big-endian)
-def get_number_be(data: bytes, start: int, length: int) -> int:
-    return int.from_bytes(data[start:start+length], byteorder='big')
-
-# Funzione per ottenere un intero da un blocco (considerato come array di 4-byte, es. per estrarre un campo a partire da un offset)
-def get_bits(data: bytes, bit_offset: int, bit_length: int) -> int:
-    # Calcoliamo il byte di partenza
-    byte_offset = bit_offset // 8
-    # Leggiamo abbastanza byte
-    num_bytes = (bit_offset % 8 + bit_length + 7) // 8
-    chunk = int.from_bytes(data[byte_offset:byte_offset+num_bytes], byteorder='big')
-    # Spostiamo per eliminare i bit iniziali in eccesso
-    shift = (num_bytes * 8) - (bit_offset % 8 + bit_length)
-    return (chunk >> shift) & ((1 << bit_length) - 1)
+# Valore decimale dei due nibble di ogni byte (nibble alto * 10 + nibble basso)
+HEX_NUM_BYTE = tuple((b >> 4) * 10 + (b & 0xF) for b in range(256))
 
 # Funzione per convertire un numero esadecimale in "numero decimale" interpretando ogni nibble come cifra decimale
 def hex_num(hex_val: int) -> int:
     result = 0
     multiplier = 1
-    # Processa nibble per nibble (fino a 8 nibble per 32-bit)
+    # Processa un byte (due nibble) alla volta tramite la tabella
     while hex_val:
-        nibble = hex_val & 0xF
-        result += nibble * multiplier
-        multiplier *= 10
-        hex_val //= 16
+        result += HEX_NUM_BYTE[hex_val & 0xFF] * multiplier
+        multiplier *= 100
+        hex_val >>= 8
     return result
 
+# Contributo di ogni cifra alla somma Luhn: [0] posizioni raddoppiate, [1] posizioni semplici
+LUHN_DIGITS = (
+    (0, 2, 4, 6, 8, 1, 3, 5, 7, 9),
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+)
+
 # Algoritmo Luhn per calcolare il check digit
 def calculate_luhn(number: int) -> int:
     payload = number // 10
     total_sum = 0
     position = 0
     while payload > 0:
-        digit = payload % 10
-        if position % 2 == 0:
-            digit *= 2
-        if digit > 9:
-            digit = (digit // 10) + (digit % 10)
-        total_sum += digit
-        payload //= 10
-        position += 1
+        payload, digit = divmod(payload, 10)
+        total_sum += LUHN_DIGITS[position][digit]
+        position ^= 1
     return (10 - (total_sum % 10)) % 10
 
-# Configurazioni per Social Moscow: per 1K e 4K
-class SocialMoscowCardConfig:
-    def __init__(self, keys, data_sector):
-        self.keys = keys
-        self.data_sector = data_sector
+# Configurazioni per Social Moscow: per 1K e 4K.
+# Le istanze sono condivise tra le chiamate, quindi immutabili (anche la tabella chiavi).
+class SocialMoscowCardConfig(namedtuple("SocialMoscowCardConfig",
+                                        ["keys", "data_sector", "key_blob", "keys_a", "trailer_offset"])):
+    __slots__ = ()
+
+    def __new__(cls, keys, data_sector):
+        # Blob contiguo A|B per settore e chiavi A estratte dal blob, calcolati una volta sola
+        key_blob = pack_keys(keys)
+        return super().__new__(cls, tuple(MappingProxyType(k) for k in keys), data_sector,
+                               key_blob, blob_keys_a(key_blob),
+                               # Offset del trailer del settore dati (blocco data_sector * 4 + 3)
+                               (data_sector * 4 + 3) * 16)
 
 # Chiavi per Social Moscow per 1K
 social_moscow_1k_keys = [
@@ -98,25 +106,37 @@ social_moscow_4k_keys = [
     {"a": 0xa0a1a2a3a4a5, "b": 0x7de02a7f6025}
 ]
 
+# Impacchetta una tabella chiavi in un unico blob: per ogni settore 6 byte di chiave A e 6 di chiave B
+def pack_keys(keys) -> bytes:
+    return b"".join(k["a"].to_bytes(KEY_LENGTH, byteorder='big') + k["b"].to_bytes(KEY_LENGTH, byteorder='big')
+                    for k in keys)
+
+# Chiavi A per settore (tuple piatte), estratte dal blob: confrontabili direttamente con il trailer
+def blob_keys_a(blob: bytes) -> tuple:
+    return tuple(blob[k:k + KEY_LENGTH] for k in range(0, len(blob), KEY_ENTRY_SIZE))
+
+# Configurazioni (istanze uniche) indicizzate per tipo di carta, in minuscolo
+SOCIAL_MOSCOW_CONFIGS = {
+    "1k": SocialMoscowCardConfig(social_moscow_1k_keys, DATA_SECTOR),
+    "4k": SocialMoscowCardConfig(social_moscow_4k_keys, DATA_SECTOR),
+}
+
+# Chiavi A per settore (tuple piatte), confrontabili direttamente con il trailer
+social_moscow_1k_keys_a = SOCIAL_MOSCOW_CONFIGS["1k"].keys_a
+social_moscow_4k_keys_a = SOCIAL_MOSCOW_CONFIGS["4k"].keys_a
+
 def social_moscow_get_card_config(card_type: str) -> SocialMoscowCardConfig:
-    # Se card_type è "1k", usa le chiavi 1K, altrimenti "4k" per 4K
-    if card_type.lower() == "1k":
-        return SocialMoscowCardConfig(social_moscow_1k_keys, 15)
-    elif card_type.lower() == "4k":
-        return SocialMoscowCardConfig(social_moscow_4k_keys, 15)
-    else:
-        return None
+    # "1k" usa le chiavi 1K, "4k" le chiavi 4K; qualsiasi altro tipo restituisce None
+    return SOCIAL_MOSCOW_CONFIGS.get(card_type.lower())
 
 def social_moscow_verify(nfc_data: bytes, card_type: str) -> bool:
     config = social_moscow_get_card_config(card_type)
     if config is None:
         return False
     # Il blocco trailer del settore è al blocco: data_sector * 4 + 3
-    block_num = config.data_sector * 4 + 3
-    trailer = get_block(nfc_data, block_num)
-    key_a = int.from_bytes(trailer[0:6], byteorder='big')
-    expected_key = config.keys[config.data_sector]["a"]
-    return key_a == expected_key
+    offset = config.trailer_offset
+    key_a = nfc_data[offset:offset + KEY_LENGTH]
+    return key_a == config.keys_a[config.data_sector]
 
 def social_moscow_read(nfc_data: bytes) -> bytes:
     # In questa conversione, assumiamo che nfc_data contenga già il dump completo.
@@ -124,48 +144,50 @@ def social_moscow_read(nfc_data: bytes) -> bytes:
         raise ValueError("Dump too short")
     return nfc_data
 
+# Parametri del CRC a 48 bit usato da taghash
+TAGHASH_SEED = 0x9AE903260CC4
+CRC48_MASK = 0xFFFFFFFFFFFF
+CRC48_TOP = 0x800000000000
+CRC48_POLY = 0x42f0e1eba9ea3693
+
 # Funzioni helper per estrarre campi da blocchi specifici
 def taghash(uid: int) -> int:
-    result = 0x9AE903260CC4
+    result = TAGHASH_SEED
     uid_bytes = uid.to_bytes(UID_LEN, byteorder='little')
     for b in uid_bytes:
         result = crc64_like(result, b)
     return result
 
-def crc64_like(result: int, sector: int) -> int:
-    result ^= (sector << 40)
-    for i in range(8):
-        if result & 0x800000000000:
-            result = ((result << 1) & 0xFFFFFFFFFFFF) ^ 0x42f0e1eba9ea3693
+def taghash_batch(uids) -> list:
+    """Calcola taghash per una sequenza di UID (scansione di molti dump)."""
+    crc = crc64_like
+    results = []
+    for uid in uids:
+        result = TAGHASH_SEED
+        for b in uid.to_bytes(UID_LEN, byteorder='little'):
+            result = crc(result, b)
+        results.append(result)
+    return results
+
+def _crc48_nibble_entry(nibble: int) -> int:
+    # Quattro passi bit a bit a partire dal nibble alto; come nel calcolo originale
+    # restano i bit oltre il 48esimo introdotti dall'ultimo XOR col polinomio
+    c = nibble << 44
+    for _ in range(4):
+        if c & CRC48_TOP:
+            c = ((c << 1) & CRC48_MASK) ^ CRC48_POLY
         else:
-            result = (result << 1) & 0xFFFFFFFFFFFF
-    return result
+            c = (c << 1) & CRC48_MASK
+    return c
 
-# Converte un valore esadecimale in un numero decimale interpretando ogni nibble come cifra
-def hex_num(hex_val: int) -> int:
-    result = 0
-    multiplier = 1
-    while hex_val:
-        nibble = hex_val & 0xF
-        result += nibble * multiplier
-        multiplier *= 10
-        hex_val //= 16
-    return result
+# Tabella a 4 bit (half-byte): elabora un nibble per passo invece di un bit
+CRC48_T4 = tuple(_crc48_nibble_entry(i) for i in range(16))
 
-def calculate_luhn(number: int) -> int:
-    payload = number // 10
-    total_sum = 0
-    position = 0
-    while payload > 0:
-        digit = payload % 10
-        if position % 2 == 0:
-            digit *= 2
-        if digit > 9:
-            digit = (digit // 10) + (digit % 10)
-        total_sum += digit
-        payload //= 10
-        position += 1
-    return (10 - (total_sum % 10)) % 10
+def crc64_like(result: int, sector: int) -> int:
+    result ^= (sector << 40)
+    table = CRC48_T4
+    result = ((result << 4) & CRC48_MASK) ^ table[(result >> 44) & 0xF]
+    return ((result << 4) & CRC48_MASK) ^ table[(result >> 44) & 0xF]
 
 def mosgortrans_parse_transport_block(block: bytes) -> str:
     # Simulazione del parsing dei dati di trasporto.
@@ -184,44 +206,53 @@ def social_moscow_parse(nfc_data: bytes, card_type: str) -> str:
         return "Error: unsupported card type."
     
     # Verifica chiave: blocco trailer del settore config.data_sector
-    block_num = config.data_sector * 4 + 3
-    trailer = get_block(nfc_data, block_num)
-    key_a = int.from_bytes(trailer[0:6], byteorder='big')
-    expected_key = config.keys[config.data_sector]["a"]
-    if key_a != expected_key:
+    offset = config.trailer_offset
+    key_a = nfc_data[offset:offset + KEY_LENGTH]
+    if key_a != config.keys_a[config.data_sector]:
         return "Error: key verification failed."
     
     # Estrai campi dal blocco 60
-    block60 = get_block(nfc_data, 60)
-    card_code = int.from_bytes(block60[1:4], byteorder='big')
-    card_region = block60[4]
-    card_number = int.from_bytes(block60[5:10], byteorder='big')
-    card_control = block60[10] >> 4
+    (code_raw, card_region, number_hi, number_lo, control_raw,
+     year, month, valid_hi, valid_lo) = BLOCK60_LAYOUT.unpack_from(nfc_data, 60 * 16)
+    card_code = code_raw & 0xFFFFFF
+    card_number = (number_hi << 32) | number_lo
+    card_control = control_raw >> 4
     # Dal blocco 21: omc_number (8 byte a partire dal byte 1)
-    block21 = get_block(nfc_data, 21)
-    omc_number = int.from_bytes(block21[1:9], byteorder='big')
-    year = block60[11]
-    month = block60[12]
+    (omc_number,) = BLOCK21_LAYOUT.unpack_from(nfc_data, 21 * 16)
     
-    number = (hex_num(card_control) +
-              hex_num(card_number) * 10 +
-              hex_num(card_region) * 10 * 10000000000 +
-              hex_num(card_code) * 10 * 10000000000 * 100)
+    # I nibble sono già cifre decimali: concatenati in una stringa danno direttamente il numero
+    # (codice | regione, 2 cifre | numero, 10 cifre | controllo, 1 cifra)
+    digits = f"{card_code:x}{card_region:02x}{card_number:010x}{card_control:x}"
+    if digits.isdigit():
+        number = int(digits)
+    else:
+        # Nibble > 9: hex_num li pesa comunque per 10^i, con riporto sulle cifre successive
+        number = (hex_num(card_control) +
+                  hex_num(card_number) * 10 +
+                  hex_num(card_region) * 10 * 10000000000 +
+                  hex_num(card_code) * 10 * 10000000000 * 100)
     
     luhn = calculate_luhn(number)
     if luhn != card_control:
         return "Error: Luhn check failed."
     
-    metro_result = mosgortrans_parse_transport_block(get_block(nfc_data, 4))
-    ground_result = mosgortrans_parse_transport_block(get_block(nfc_data, 16))
+    mv = memoryview(nfc_data)
+    metro_result = mosgortrans_parse_transport_block(get_block(mv, 4))
+    ground_result = mosgortrans_parse_transport_block(get_block(mv, 16))
     
-    output = (f"Social ecard\nNumber: {card_code:x} {card_region:x} {card_number:0x} {card_control:x}\n"
-              f"OMC: {omc_number:x}\nValid for: {month:02x}/{year:02x} {block60[13]:02x}{block60[14]:02x}\n")
+    parts = [
+        "Social ecard",
+        f"Number: {card_code:x} {card_region:x} {card_number:0x} {card_control:x}",
+        f"OMC: {omc_number:x}",
+        f"Valid for: {month:02x}/{year:02x} {valid_hi:02x}{valid_lo:02x}",
+    ]
     if metro_result:
-        output += render_section_header("Metro", 22, 21) + "\n" + metro_result + "\n"
+        parts.append(render_section_header("Metro", 22, 21))
+        parts.append(metro_result)
     if ground_result:
-        output += render_section_header("Ground", 21, 20) + "\n" + ground_result + "\n"
-    return output
+        parts.append(render_section_header("Ground", 21, 20))
+        parts.append(ground_result)
+    return "\n".join(parts) + "\n"
 
 def main():
     if len(sys.argv) != 3:
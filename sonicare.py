@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 import sys
 
+# Link NDEF atteso a partire dal byte 5*4 + 3 del dump
+SONICARE_NDEF_MARKER = b"philips.com/nfcbrushheadtap"
+SONICARE_NDEF_MARKER_OFFSET = 5 * 4 + 3
+
 def read_page(dump: bytes, page: int) -> bytes:
-    """Restituisce i 4 byte del blocco 'page' dal dump."""
+    """Restituisce i 4 byte del blocco 'page' dal dump (senza copia se dump è un memoryview)."""
     start = page * 4
     return dump[start:start+4]
 
@@ -22,14 +26,13 @@ def sonicare_get_seconds_brushed(dump: bytes) -> int:
     return page36[0] + (page36[1] << 8)
 
 def sonicare_parse(dump: bytes) -> str:
-    # Verifica il link NDEF: a partire dal byte (5*4 + 3) il dump deve contenere la stringa test
-    test = b"philips.com/nfcbrushheadtap"
-    offset = 5 * 4 + 3
-    if dump[offset: offset + len(test)] != test:
+    # Verifica il link NDEF: a partire dal byte (5*4 + 3) il dump deve contenere il marker
+    if not dump.startswith(SONICARE_NDEF_MARKER, SONICARE_NDEF_MARKER_OFFSET):
         return "Not a Philips Sonicare head"
     
-    head_type = sonicare_get_head_type(dump)
-    seconds_brushed = sonicare_get_seconds_brushed(dump)
+    mv = memoryview(dump)
+    head_type = sonicare_get_head_type(mv)
+    seconds_brushed = sonicare_get_seconds_brushed(mv)
     hours = seconds_brushed // 3600
     minutes = (seconds_brushed // 60) % 60
     seconds = seconds_brushed % 60
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 import sys
 import struct
+from types import MappingProxyType
 
 # Dimensione di un blocco (16 byte)
 BLOCK_SIZE = 16
+KEY_LENGTH = 6
+KEY_ENTRY_SIZE = 2 * KEY_LENGTH  # chiave A + chiave B per settore nei blob delle chiavi
+# Blocco vuoto (tutto 0xFF), precalcolato per il confronto nei blocchi di trasporto
+ALL_FF_BLOCK = b'\xFF' * BLOCK_SIZE
 
-# Funzione per leggere un blocco dal dump
+# Funzione per leggere un blocco dal dump (senza copia se card_data è un memoryview)
 def get_block(card_data: bytes, block_num: int) -> bytes:
     start = block_num * BLOCK_SIZE
     return card_data[start:start + BLOCK_SIZE]
@@ -50,15 +55,43 @@ troika_4k_keys = [
     {"a": 0x2AA05ED1856F, "b": 0xEAAC88E5DC99},
 ]
 
+# Impacchetta una tabella chiavi in un unico blob: per ogni settore 6 byte di chiave A e 6 di chiave B
+def pack_keys(keys) -> bytes:
+    return b"".join(k["a"].to_bytes(KEY_LENGTH, byteorder='big') + k["b"].to_bytes(KEY_LENGTH, byteorder='big')
+                    for k in keys)
+
+# Chiavi A per settore (tuple piatte), estratte dal blob: confrontabili direttamente con il trailer
+def blob_keys_a(blob: bytes) -> tuple:
+    return tuple(blob[k:k + KEY_LENGTH] for k in range(0, len(blob), KEY_ENTRY_SIZE))
+
+TROIKA_1K_KEY_BLOB = pack_keys(troika_1k_keys)
+TROIKA_4K_KEY_BLOB = pack_keys(troika_4k_keys)
+troika_1k_keys_a = blob_keys_a(TROIKA_1K_KEY_BLOB)
+troika_4k_keys_a = blob_keys_a(TROIKA_4K_KEY_BLOB)
+
+# Tabella chiavi in sola lettura: tupla di mapping {"a", "b"} non modificabili
+def read_only_keys(keys) -> tuple:
+    return tuple(MappingProxyType(k) for k in keys)
+
+# Offset del blocco trailer (data_sector * 4 + 3) di un settore
+def trailer_offset(sector: int) -> int:
+    return (sector * 4 + 3) * BLOCK_SIZE
+
+# Configurazioni della carta Troika (istanze uniche) indicizzate per tipo, in minuscolo
+TROIKA_CONFIGS = {
+    "1k": MappingProxyType({"data_sector": 11, "keys": read_only_keys(troika_1k_keys),
+                            "key_blob": TROIKA_1K_KEY_BLOB, "trailer_offset": trailer_offset(11),
+                            "expected_key": troika_1k_keys_a[11]}),
+    "4k": MappingProxyType({"data_sector": 8, "keys": read_only_keys(troika_4k_keys),
+                            "key_blob": TROIKA_4K_KEY_BLOB, "trailer_offset": trailer_offset(8),
+                            "expected_key": troika_4k_keys_a[8]}),
+}
+
 # Configurazione della carta Troika
 def troika_get_card_config(card_type: str):
-    # card_type: "1k" o "4k"
-    if card_type.lower() == "1k":
-        return {"data_sector": 11, "keys": troika_1k_keys}
-    elif card_type.lower() == "4k":
-        return {"data_sector": 8, "keys": troika_4k_keys}
-    else:
-        return None
+    # card_type: "1k" o "4k"; qualsiasi altro tipo restituisce None
+    # La configurazione è condivisa tra le chiamate, quindi viene esposta in sola lettura
+    return TROIKA_CONFIGS.get(card_type.lower())
 
 # Funzione per verificare la chiave di un settore
 def troika_verify_type(nfc_data: bytes, card_type: str) -> bool:
@@ -66,12 +99,9 @@ def troika_verify_type(nfc_data: bytes, card_type: str) -> bool:
     if config is None:
         return False
     # Il blocco trailer del settore config["data_sector"] si trova a: (data_sector * 4 + 3)
-    block_num = config["data_sector"] * 4 + 3
-    trailer = get_block(nfc_data, block_num)
     # I primi 6 byte del trailer costituiscono la chiave A
-    stored_key = int.from_bytes(trailer[0:6], byteorder='big')
-    expected_key = config["keys"][config["data_sector"]]["a"]
-    return stored_key == expected_key
+    offset = config["trailer_offset"]
+    return nfc_data[offset:offset + KEY_LENGTH] == config["expected_key"]
 
 def troika_verify(nfc_data: bytes, card_type: str) -> bool:
     return troika_verify_type(nfc_data, card_type)
@@ -85,7 +115,7 @@ def troika_read(nfc_data: bytes, card_type: str) -> bool:
 # Funzione dummy per simulare il parsing dei dati di trasporto
 def mosgortrans_parse_transport_block(block: bytes) -> str:
     # Se il blocco non è tutto 0xFF, restituisce una stringa fittizia
-    if block == b'\xFF' * BLOCK_SIZE:
+    if block == ALL_FF_BLOCK:
         return ""
     return f"Transport block data: {block.hex()}"
 
@@ -96,26 +126,24 @@ def troika_parse(nfc_data: bytes, card_type: str) -> str:
         return "Error: unsupported card type."
     
     # Verifica la chiave nel trailer del settore configurato
-    block_num = config["data_sector"] * 4 + 3
-    trailer = get_block(nfc_data, block_num)
-    stored_key = int.from_bytes(trailer[0:6], byteorder='big')
-    expected_key = config["keys"][config["data_sector"]]["a"]
-    if stored_key != expected_key:
+    offset = config["trailer_offset"]
+    if nfc_data[offset:offset + KEY_LENGTH] != config["expected_key"]:
         return "Error: key verification failed."
     
     # Simula il parsing dei dati di trasporto da tre blocchi: 32 (Metro), 28 (Ground) e 16 (TAT)
-    metro_result = mosgortrans_parse_transport_block(get_block(nfc_data, 32))
-    ground_result = mosgortrans_parse_transport_block(get_block(nfc_data, 28))
-    tat_result = mosgortrans_parse_transport_block(get_block(nfc_data, 16))
+    mv = memoryview(nfc_data)
+    metro_result = mosgortrans_parse_transport_block(get_block(mv, 32))
+    ground_result = mosgortrans_parse_transport_block(get_block(mv, 28))
+    tat_result = mosgortrans_parse_transport_block(get_block(mv, 16))
     
-    output = "Troyka card\n"
+    parts = ["Troyka card"]
     if metro_result:
-        output += metro_result + "\n"
+        parts.append(metro_result)
     if ground_result:
-        output += ground_result + "\n"
+        parts.append(ground_result)
     if tat_result:
-        output += tat_result + "\n"
-    return output
+        parts.append(tat_result)
+    return "\n".join(parts) + "\n"
 
 def main():
     if len(sys.argv) != 3:
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import sys
+import struct
 
 # Costanti
 LATEST_SALE_MARKER = 0x02
@@ -10,41 +11,39 @@ BALANCE_PAGE = 0x08              # pagina 8
 SALE_YEAR_OFFSET = 2000
 PAGE_SIZE = 4  # 4 byte per pagina
 
-def get_pages(data: bytes):
-    """Divide il dump in pagine da 4 byte."""
-    return [data[i:i+PAGE_SIZE] for i in range(0, len(data), PAGE_SIZE)]
+# Offset in byte delle pagine lette dal parser (il dump è indicizzato direttamente)
+SALE_RECORD_TIME_STAMP_A_OFFSET = SALE_RECORD_TIME_STAMP_A * PAGE_SIZE
+SALE_RECORD_TIME_STAMP_B_OFFSET = SALE_RECORD_TIME_STAMP_B * PAGE_SIZE
+FULL_SALE_TIME_STAMP_OFFSET = FULL_SALE_TIME_STAMP_PAGE * PAGE_SIZE
+BALANCE_OFFSET = BALANCE_PAGE * PAGE_SIZE
 
-def get_bits(data: bytes, bit_offset: int, bit_length: int) -> int:
+U16 = struct.Struct(">H")
+U32 = struct.Struct(">I")
+
+def get_bits_u32(data: bytes, offset: int, bit_offset: int, bit_length: int) -> int:
     """
-    Estrae 'bit_length' bit da 'data' (big-endian) a partire dal 'bit_offset'.
+    Estrae 'bit_length' bit dalla pagina (u32 big-endian) che inizia a 'offset',
+    a partire dal 'bit_offset'.
     """
-    total_bits = len(data) * 8
-    if bit_offset + bit_length > total_bits:
-        raise ValueError("Out of bounds in get_bits")
-    value = int.from_bytes(data, byteorder='big')
-    shift = total_bits - (bit_offset + bit_length)
-    return (value >> shift) & ((1 << bit_length) - 1)
+    if bit_offset + bit_length > 32:
+        raise ValueError("Out of bounds in get_bits_u32")
+    (value,) = U32.unpack_from(data, offset)
+    return (value >> (32 - bit_offset - bit_length)) & ((1 << bit_length) - 1)
 
 def trt_parse(dump: bytes) -> str:
-    pages = get_pages(dump)
-    
     # Verifica la presenza del marker in pagina 12 o 14
-    latest_sale_page = 0
-    if pages[SALE_RECORD_TIME_STAMP_A][0] == LATEST_SALE_MARKER:
-        latest_sale_page = SALE_RECORD_TIME_STAMP_A
-    elif pages[SALE_RECORD_TIME_STAMP_B][0] == LATEST_SALE_MARKER:
-        latest_sale_page = SALE_RECORD_TIME_STAMP_B
+    if dump[SALE_RECORD_TIME_STAMP_A_OFFSET] == LATEST_SALE_MARKER:
+        latest_sale_offset = SALE_RECORD_TIME_STAMP_A_OFFSET
+    elif dump[SALE_RECORD_TIME_STAMP_B_OFFSET] == LATEST_SALE_MARKER:
+        latest_sale_offset = SALE_RECORD_TIME_STAMP_B_OFFSET
     else:
         return "Error: sale record marker not found."
 
-    # Ottieni il record parziale dalla pagina precedente
-    partial_record = pages[latest_sale_page - 1]
-    # Estrai 20 bit a partire dal bit 3 del record parziale
-    latest_sale_record = get_bits(partial_record, 3, 20)
+    # Record parziale dalla pagina precedente: 20 bit a partire dal bit 3
+    latest_sale_record = get_bits_u32(dump, latest_sale_offset - PAGE_SIZE, 3, 20)
     
-    # Ottieni il record completo dalla pagina FULL_SALE_TIME_STAMP_PAGE (pagina 9)
-    full_record = pages[FULL_SALE_TIME_STAMP_PAGE]
-    latest_sale_full_record = get_bits(full_record, 0, 27)
+    # Record completo dalla pagina FULL_SALE_TIME_STAMP_PAGE (pagina 9)
+    latest_sale_full_record = get_bits_u32(dump, FULL_SALE_TIME_STAMP_OFFSET, 0, 27)
     
     if latest_sale_record != (latest_sale_full_record & 0xFFFFF):
         return "Error: sale record copy mismatch."
@@ -60,9 +59,8 @@ def trt_parse(dump: bytes) -> str:
     sale_minute = latest_sale_full_record & 0x3F
     
     # Estrai il saldo dalla pagina BALANCE_PAGE (pagina 8)
-    balance_page = pages[BALANCE_PAGE]
     # Legge 16 bit a partire dal byte 2
-    balance = int.from_bytes(balance_page[2:4], byteorder='big')
+    (balance,) = U16.unpack_from(dump, BALANCE_OFFSET + 2)
     balance_yuan = balance // 100
     balance_cent = balance % 100
     
@@ -1,8 +1,20 @@
 #!/usr/bin/env python3
 import sys
+import struct
 
 BLOCK_SIZE = 16
 MAX_BLOCKS = 64
+KEY_LENGTH = 6
+VERIFY_SECTOR = 4
+# Offset del blocco trailer del settore di verifica (blocco VERIFY_SECTOR * 4 + 3)
+VERIFY_TRAILER_OFFSET = (VERIFY_SECTOR * 4 + 3) * BLOCK_SIZE
+
+# UID della sezione "Plantain" (blocco 0): 7 byte little-endian, letti come u32 + u16 + u8
+PLANTAIN_UID_LAYOUT = struct.Struct("<IHB")
+# Saldo della sezione "Plantain" (blocco 16): u32 little-endian
+PLANTAIN_BALANCE_LAYOUT = struct.Struct("<I")
+# Sezione "Troika" (blocchi 32-33): number a 28 bit (u32 @2) e balance (u16 @21 = blocco 33 byte 5)
+TROIKA_LAYOUT = struct.Struct(">2xI15xH")
 
 # Chiavi per TwoCities (4K) (solo un array, utilizzato per tutte le sezioni)
 two_cities_4k_keys = [
@@ -48,16 +60,16 @@ two_cities_4k_keys = [
     {"a": 0x7259fa0197c6, "b": 0x5583698df085},
 ]
 
+# Chiavi A per settore (tupla piatta), come 6 byte big-endian confrontabili con il trailer
+two_cities_4k_keys_a = tuple(k["a"].to_bytes(KEY_LENGTH, byteorder='big') for k in two_cities_4k_keys)
+VERIFY_KEY_A = two_cities_4k_keys_a[VERIFY_SECTOR]
+
 def two_cities_verify(nfc_data: bytes) -> bool:
     """
     Verifica la chiave nel settore 4 della carta TwoCities.
     """
-    verify_sector = 4
-    block_num = verify_sector * 4 + 3  # blocco trailer del settore 4
-    trailer = nfc_data[block_num * BLOCK_SIZE:(block_num + 1) * BLOCK_SIZE]
-    stored_key = int.from_bytes(trailer[0:6], byteorder='big')
-    expected_key = two_cities_4k_keys[verify_sector]["a"]
-    return stored_key == expected_key
+    stored_key = nfc_data[VERIFY_TRAILER_OFFSET:VERIFY_TRAILER_OFFSET + KEY_LENGTH]
+    return stored_key == VERIFY_KEY_A
 
 def two_cities_read(nfc_data: bytes) -> bool:
     """
@@ -74,32 +86,25 @@ def two_cities_parse(nfc_data: bytes) -> str:
       - Formattta l’output.
     """
     # Verifica chiave nel settore 4
-    sector = 4
-    trailer_block_num = sector * 4 + 3
-    trailer = nfc_data[trailer_block_num * BLOCK_SIZE:(trailer_block_num + 1) * BLOCK_SIZE]
-    stored_key = int.from_bytes(trailer[0:6], byteorder='big')
-    if stored_key != two_cities_4k_keys[sector]["a"]:
+    stored_key = nfc_data[VERIFY_TRAILER_OFFSET:VERIFY_TRAILER_OFFSET + KEY_LENGTH]
+    if stored_key != VERIFY_KEY_A:
         return "Error: key verification failed."
     
     # Sezione "Plantain": blocco 16 contiene il saldo
-    block16 = nfc_data[16 * BLOCK_SIZE:(16 + 1) * BLOCK_SIZE]
-    # I primi 4 byte del blocco, in ordine invertito, formano il saldo (diviso per 100)
-    balance_bytes = block16[0:4][::-1]
-    balance = int.from_bytes(balance_bytes, byteorder='big') // 100
+    # I primi 4 byte del blocco, little-endian, formano il saldo (diviso per 100)
+    (balance,) = PLANTAIN_BALANCE_LAYOUT.unpack_from(nfc_data, 16 * BLOCK_SIZE)
+    balance //= 100
     
-    # Estrai UID dalla sezione "Plantain": dal blocco 0, primi 7 byte invertiti
-    block0 = nfc_data[0:BLOCK_SIZE]
-    uid_bytes = block0[0:7][::-1]
-    card_number = int.from_bytes(uid_bytes, byteorder='big')
+    # Estrai UID dalla sezione "Plantain": dal blocco 0, primi 7 byte little-endian
+    uid_lo, uid_mid, uid_hi = PLANTAIN_UID_LAYOUT.unpack_from(nfc_data, 0)
+    card_number = uid_lo | (uid_mid << 32) | (uid_hi << 48)
     
     # Sezione "Troika": 
-    # Dal blocco 33, a partire dal byte 5, leggi 4 byte per il troika balance, 
-    # interpretati come big-endian e divisi per 25.
-    block33 = nfc_data[33 * BLOCK_SIZE:(33 + 1) * BLOCK_SIZE]
-    troika_balance = int.from_bytes(block33[5:7], byteorder='big') // 25
-    # Dal blocco 32, a partire dal byte 2, leggi 4 byte (big-endian) e shift right di 4 bit per il troika number
-    block32 = nfc_data[32 * BLOCK_SIZE:(32 + 1) * BLOCK_SIZE]
-    troika_number = int.from_bytes(block32[2:6], byteorder='big') >> 4
+    # Dal blocco 32, a partire dal byte 2, leggi 4 byte (big-endian) e shift right di 4 bit per il troika number;
+    # dal blocco 33, a partire dal byte 5, leggi 2 byte (big-endian) divisi per 25 per il troika balance.
+    troika_raw, troika_balance_raw = TROIKA_LAYOUT.unpack_from(nfc_data, 32 * BLOCK_SIZE)
+    troika_number = troika_raw >> 4
+    troika_balance = troika_balance_raw // 25
     
     output_lines = [
         "TwoCities card",
@@ -1,23 +1,30 @@
 #!/usr/bin/env python3
 import sys
 import struct
+from functools import lru_cache
 
 BLOCK_SIZE = 16
+TICKET_SECTOR = 8
+TICKET_SECTOR_OFFSET = TICKET_SECTOR * 4 * BLOCK_SIZE  # blocco 32
 
-def get_block(data: bytes, block_num: int) -> bytes:
-    """Restituisce il blocco (16 byte) dal dump."""
-    start = block_num * BLOCK_SIZE
-    return data[start:start + BLOCK_SIZE]
-
-def bytes_to_int_be(b: bytes) -> int:
-    """Converte i byte in un intero (big-endian)."""
-    return int.from_bytes(b, byteorder='big')
+# Layout dei blocchi 0-2 del settore 8 (big-endian), letti con una sola unpack_from
+#   header: due u32 complementari
+#   blocco 1: expiry (u16 @1), refill counter (@7), card number (u32 @8), regione bassa (@12)
+#   blocco 2: valid_to (u16 @0), terminale (24 bit, u32 @2), ultima ricarica (u16 @6),
+#             rubli (u16 @8), copechi (@10)
+TICKET_SECTOR_LAYOUT = struct.Struct(
+    ">II8x"          # header
+    "xH4xBIB3x"      # blocco 1
+    "HIHHB"          # blocco 2
+)
+UMARSH_DUMP_SIZE = 1024  # Mifare Classic 1K: 16 settori da 4 blocchi
 
+@lru_cache(maxsize=4096)
 def parse_datetime(date_val: int) -> (bool, str):
     """
     Converte un valore a 16 bit in una data.
     Formato: anno = 2000 + (date >> 9), mese = (date >> 5) & 0x0F, giorno = date & 0x1F.
-    Restituisce (valid, formatted_date)
+    Restituisce (valid, formatted_date); i risultati sono memorizzati per valore grezzo.
     """
     if date_val == 0:
         return (False, "")
@@ -30,33 +37,43 @@ def umarsh_parse(dump: bytes) -> str:
     # Assumiamo dump completo di una Mifare Classic 1K (256 byte, 16 blocchi per settore, 16 settori)
     # Settore interessato: 8. Per 1K, la funzione mf_classic_get_first_block_num_of_sector(ticket_sector)
     # equivale a ticket_sector * 4.
-    ticket_sector = 8
-    ticket_sector_start = ticket_sector * 4  # blocco 32
+    if len(dump) < TICKET_SECTOR_OFFSET + 3 * BLOCK_SIZE:
+        return "Error: dump too short."
+    return _umarsh_parse_sector(dump, TICKET_SECTOR_OFFSET)
+
+def umarsh_parse_batch(dumps: bytes, dump_size: int = UMARSH_DUMP_SIZE) -> list:
+    """
+    Decodifica più dump concatenati nello stesso buffer (dump_size byte ciascuno).
+    I campi vengono letti con unpack_from direttamente dal buffer, senza copiare i singoli dump.
+    """
+    # Ogni dump deve contenere per intero il settore del biglietto
+    if dump_size < TICKET_SECTOR_OFFSET + TICKET_SECTOR_LAYOUT.size:
+        raise ValueError("dump_size too small for the ticket sector")
+    last = len(dumps) - dump_size
+    return [_umarsh_parse_sector(dumps, base + TICKET_SECTOR_OFFSET)
+            for base in range(0, last + 1, dump_size)]
+
+def _umarsh_parse_sector(dump: bytes, sector_offset: int) -> str:
+    (header_part_0, header_part_1,
+     expiry_date, refill_counter, number_raw, region_low,
+     valid_to, terminal_raw, last_refill_date, balance_raw, kop_raw) = TICKET_SECTOR_LAYOUT.unpack_from(
+        dump, sector_offset)
 
-    # Header: dal blocco ticket_sector_start (blocco 32)
-    header_block = get_block(dump, ticket_sector_start)
-    header_part_0 = bytes_to_int_be(header_block[0:4])
-    header_part_1 = bytes_to_int_be(header_block[4:8])
+    # Header: dal primo blocco del settore (blocco 32)
     if (header_part_0 + header_part_1) != 0xFFFFFFFF:
         return "Error: invalid header in ticket sector."
 
     # Blocco 1 (blocco 33)
-    block1 = get_block(dump, ticket_sector_start + 1)
-    expiry_date = bytes_to_int_be(block1[1:3])
     # region_number: ((block1[8] >> 5) & 0x07) << 4  ORed con (block1[12] & 0x0F)
-    region_number = (((block1[8] >> 5) & 0x07) << 4) | (block1[12] & 0x0F)
-    refill_counter = block1[7]
-    card_number = bytes_to_int_be(block1[8:12]) & 0x3FFFFFFF
+    region_number = (((number_raw >> 29) & 0x07) << 4) | (region_low & 0x0F)
+    card_number = number_raw & 0x3FFFFFFF
     if card_number == 0:
         return "Error: card number is 0."
 
     # Blocco 2 (blocco 34)
-    block2 = get_block(dump, ticket_sector_start + 2)
-    valid_to = bytes_to_int_be(block2[0:2])
-    terminal_number = bytes_to_int_be(block2[3:6])
-    last_refill_date = bytes_to_int_be(block2[6:8])
-    balance_rub = bytes_to_int_be(block2[8:10]) & 0x7FFF
-    balance_kop = block2[10] & 0x7F
+    terminal_number = terminal_raw & 0xFFFFFF
+    balance_rub = balance_raw & 0x7FFF
+    balance_kop = kop_raw & 0x7F
 
     valid_expiry, expiry_str = parse_datetime(expiry_date)
     valid_valid_to, valid_to_str = parse_datetime(valid_to)
@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 import sys
+import struct
 
 BLOCK_SIZE = 16
 TOTAL_BLOCKS_1K = 64  # Mifare Classic 1K: 64 blocchi
+KEY_LENGTH = 6
+VERIFY_SECTOR = 1
+# Offset del blocco letto per la verifica (settore 1 * 4 + 0)
+VERIFY_KEY_OFFSET = VERIFY_SECTOR * 4 * BLOCK_SIZE
+# Saldo: u16 big-endian dal byte 2 del blocco 0 del settore 1
+BALANCE_OFFSET = VERIFY_SECTOR * 4 * BLOCK_SIZE + 2
+BALANCE_LAYOUT = struct.Struct(">H")
+# UID (card number): u32 big-endian nei primi 4 byte del dump
+UID_LAYOUT = struct.Struct(">I")
 
-def get_block(data: bytes, block_num: int) -> bytes:
-    """Restituisce il blocco di 16 byte corrispondente al numero di blocco."""
-    start = block_num * BLOCK_SIZE
-    return data[start:start+BLOCK_SIZE]
-
-def bytes_to_int_be(b: bytes) -> int:
-    """Converte una sequenza di byte (big-endian) in intero."""
-    return int.from_bytes(b, byteorder='big')
+# Rappresentazione a due cifre dei centesimi 0..99
+TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
 
 # Chiavi per WashCity (Mifare Classic 1K) per ciascun settore (0..15)
 washcity_1k_keys = [
@@ -33,18 +37,17 @@ washcity_1k_keys = [
     {"a": 0x010155010100, "b": 0xFFFFFFFFFFFF},  # Sector 15
 ]
 
+# Chiavi A per settore come 6 byte big-endian, confrontabili direttamente con il dump
+washcity_1k_keys_a = tuple(k["a"].to_bytes(KEY_LENGTH, byteorder='big') for k in washcity_1k_keys)
+
 def washcity_verify(nfc_data: bytes) -> bool:
     """
     Verifica la chiave del settore 1:
     Il blocco trailer del settore 1 (settore 1 * 4 + 0) deve contenere, nei primi 6 byte, la chiave attesa.
     """
-    verify_sector = 1
     # Il trailer del settore 1 si trova nel blocco: sector * 4 + 0 (in questo caso ticket_block_number = 0)
-    block_num = verify_sector * 4
-    trailer = get_block(nfc_data, block_num)
-    stored_key = int.from_bytes(trailer[0:6], byteorder='big')
-    expected_key = washcity_1k_keys[verify_sector]["a"]
-    return stored_key == expected_key
+    stored_key = nfc_data[VERIFY_KEY_OFFSET:VERIFY_KEY_OFFSET + KEY_LENGTH]
+    return stored_key == washcity_1k_keys_a[VERIFY_SECTOR]
 
 def washcity_read(nfc_data: bytes) -> bool:
     """Verifica che il dump sia sufficientemente lungo."""
@@ -58,25 +61,22 @@ def washcity_parse(nfc_data: bytes) -> str:
       - Estrae l’UID (card number) dal dump (qui usiamo i primi 4 byte).
       - Formattta l’output con il numero della carta in esadecimale e il saldo in EUR.
     """
+    nfc_data = memoryview(nfc_data)
     if not washcity_verify(nfc_data):
         return "Error: key verification failed."
     
-    ticket_sector = 1
-    start_block_num = ticket_sector * 4  # Primo blocco del settore 1
-    block = get_block(nfc_data, start_block_num)
-    # Il saldo è memorizzato a partire dal byte 2 (2 byte in big-endian)
-    balance_val = bytes_to_int_be(block[2:4])
+    # Il saldo è memorizzato nel blocco 0 del settore 1, a partire dal byte 2 (2 byte in big-endian)
+    (balance_val,) = BALANCE_LAYOUT.unpack_from(nfc_data, BALANCE_OFFSET)
     balance_usd = balance_val // 100
     balance_cents = balance_val % 100
     
     # L'UID (card number) si assume sia nei primi 4 byte del dump.
-    uid = nfc_data[0:4]
-    card_number = bytes_to_int_be(uid)
+    (card_number,) = UID_LAYOUT.unpack_from(nfc_data, 0)
     
     output = (
         "WashCity MarkItaly Card\n"
-        f"Card number: {card_number:0{len(uid)*2}X}\n"
-        f"Balance: {balance_usd}.{balance_cents:02d} EUR"
+        f"Card number: {card_number:0{UID_LAYOUT.size * 2}X}\n"
+        f"Balance: {balance_usd}.{TWO_DIGITS[balance_cents]} EUR"
     )
     return output
 
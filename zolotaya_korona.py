@@ -2,6 +2,7 @@
 import sys
 import struct
 from datetime import datetime
+from collections import namedtuple
 
 # Costanti
 BLOCK_SIZE = 16
@@ -13,76 +14,91 @@ INFO_SECTOR = 15
 TRIP_SECTOR = 4
 PURSE_SECTOR = 6
 
+# Layout (little-endian) dei campi a offset fisso
+#   refill (blocco 1 del settore TRIP, dal byte 1): machine id u16, timestamp u32, importo u32, contatore u16
+#   trip (blocco 2 del settore TRIP): lettera validatore @1, id validatore BCD 3 byte @2,
+#        timestamp u32 @6, track @10, saldo precedente u32 @11
+#   purse (blocco 0 del settore PURSE): saldo u32
+REFILL_LAYOUT = struct.Struct("<HIIH")
+TRIP_LAYOUT = struct.Struct("<xB3sxIBI")
+PURSE_LAYOUT = struct.Struct("<I")
+# Numero di sequenza (blocco 0 del settore TRIP, dal byte 8): u16 big-endian
+SEQUENCE_LAYOUT = struct.Struct(">H")
+
 # Signature attesa per il settore INFO (24 byte totali, i primi 16 nel primo blocco e i successivi 8 nel blocco seguente)
 INFO_SECTOR_SIGNATURE = bytes([
     0xE2, 0x87, 0x80, 0x8E, 0x20, 0x87, 0xAE, 0xAB, 0xAE, 0xF2, 0xA0, 0xEF, 0x20, 0x8A,
-    0xAE, 0xE0, 0xAE, 0xAD, 0xA0, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00
+    0xAE, 0xE0, 0xAE, 0xAD, 0xA0, 0x00, 0x00, 0x00, 0x00, 0x00
 ])
+# Offset in byte della signature: i blocchi 0 e 1 del settore INFO sono contigui nel dump
+INFO_SIGNATURE_OFFSET = INFO_SECTOR * 4 * BLOCK_SIZE
+INFO_SIGNATURE_END = INFO_SIGNATURE_OFFSET + len(INFO_SECTOR_SIGNATURE)
+
+# Rappresentazione a due cifre dei valori 0..99 (centesimi, giorno, mese, ore, minuti)
+TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
 
 # Funzioni di utilità
 
 def get_block(data: bytes, block_num: int) -> bytes:
-    """Restituisce il blocco (16 byte) identificato da block_num."""
+    """Restituisce il blocco (16 byte) identificato da block_num (senza copia se data è un memoryview)."""
     start = block_num * BLOCK_SIZE
     return data[start:start+BLOCK_SIZE]
 
-def bytes_to_int_be(b: bytes) -> int:
-    """Converte una sequenza di byte (big-endian) in intero."""
-    return int.from_bytes(b, byteorder='big')
-
-def bytes_to_int_le(b: bytes) -> int:
-    """Converte una sequenza di byte (little-endian) in intero."""
-    return int.from_bytes(b, byteorder='little')
+# Valore delle due cifre BCD di ogni byte (nibble alto * 10 + nibble basso), nessuna validazione
+BCD_VALUE = bytes((b >> 4) * 10 + (b & 0x0F) for b in range(256))
 
 def bcd_to_int(b: bytes) -> int:
     """
     Converte una sequenza di byte in formato BCD in un intero.
     Ogni nibble rappresenta una cifra decimale.
     """
+    # BCD valido: la rappresentazione esadecimale è già la stringa delle cifre (conversione in C)
+    digits = b.hex()
+    if digits.isdigit():
+        return int(digits)
+    # Sequenza vuota o nibble > 9: ogni nibble vale comunque la sua cifra (con riporto)
+    table = BCD_VALUE
     result = 0
     for byte in b:
-        high = (byte >> 4) & 0x0F
-        low = byte & 0x0F
-        result = result * 100 + high * 10 + low
+        result = result * 100 + table[byte]
     return result
 
 def mf_classic_first_block_of_sector(sector: int) -> int:
     """Per una carta Mifare Classic 1K, ogni settore ha 4 blocchi."""
     return sector * 4
 
-def format_date(dt: datetime, separator: str = ".") -> str:
-    """Formatta una data nel formato DD{sep}MM{sep}YYYY."""
-    return dt.strftime(f"%d{separator}%m{separator}%Y")
-
-def format_time(dt: datetime) -> str:
-    """Formatta l'orario nel formato HH:MM."""
-    return dt.strftime("%H:%M")
-
 # Simulazione della conversione di un timestamp in datetime.
 # Assumiamo che i timestamp siano in secondi dal'Unix epoch.
 def timestamp_to_datetime(ts: int) -> datetime:
     return datetime.fromtimestamp(ts)
 
-# Parser principale
-def zolotaya_korona_parse(dump: bytes) -> str:
-    # Controlla che il dump sia sufficientemente lungo
-    if len(dump) < TOTAL_BLOCKS * BLOCK_SIZE:
-        return "Errore: dump troppo corto."
+def format_timestamp(ts: int, separator: str = ".") -> (str, str):
+    """
+    Converte un timestamp in (data DD{sep}MM{sep}YYYY, orario HH:MM), senza strftime.
+    La conversione (ora locale) resta quella di timestamp_to_datetime.
+    """
+    dt = timestamp_to_datetime(ts)
+    d2 = TWO_DIGITS
+    return (f"{d2[dt.day]}{separator}{d2[dt.month]}{separator}{dt.year:04d}",
+            f"{d2[dt.hour]}:{d2[dt.minute]}")
+
+# Campi numerici della carta, estratti prima della formattazione
+ZolotayaKoronaRecord = namedtuple("ZolotayaKoronaRecord", [
+    "region_number", "card_number_prefix", "card_number_postfix",
+    "status", "sequence_number", "discount_code",
+    "refill_machine_id", "last_refill_timestamp", "last_refill_amount", "refill_counter",
+    "validator_letter", "validator_id", "last_trip_timestamp", "track_number", "prev_balance",
+    "balance",
+])
 
+def decode_zolotaya_korona(dump: bytes) -> ZolotayaKoronaRecord:
+    """
+    Estrae tutti i campi numerici dal dump (signature già verificata), senza formattazione.
+    """
     # INFO SECTOR: Il settore 15
     info_sector_start = mf_classic_first_block_of_sector(INFO_SECTOR)
-    # Prendi il primo blocco del settore INFO
     block0 = get_block(dump, info_sector_start)
-    # I primi 16 byte devono corrispondere ai primi 16 byte della signature
-    if block0 != INFO_SECTOR_SIGNATURE[:16]:
-        return "Errore: signature info settore non verificata (primo blocco)."
-    # Prendi il blocco successivo (blocco 1 del settore INFO)
-    block1 = get_block(dump, info_sector_start + 1)
-    # I successivi 8 byte della signature (dalla posizione 16 alla fine) devono corrispondere
-    if block1[:8] != INFO_SECTOR_SIGNATURE[16:]:
-        return "Errore: signature info settore non verificata (secondo blocco)."
 
-    # Se la signature è verificata, prosegui con il parsing.
     # INFO SECTOR - blocco 1:
     # Region number: BCD da 1 byte a partire dal byte 10 del blocco0 (del settore INFO)
     region_number = bcd_to_int(block0[10:11])
@@ -99,65 +115,88 @@ def zolotaya_korona_parse(dump: bytes) -> str:
     # Blocco 0 del settore TRIP: a partire dal byte 7
     trip_block0 = get_block(dump, trip_sector_start)
     status = trip_block0[7] % 16
-    sequence_number = bytes_to_int_be(trip_block0[8:10])
-    discount_code = bytes_to_int_be(trip_block0[10:11])
+    (sequence_number,) = SEQUENCE_LAYOUT.unpack_from(trip_block0, 8)
+    discount_code = trip_block0[10]
 
     # Blocco 1 del settore TRIP: refill block, a partire dal byte 1
-    trip_block1 = get_block(dump, trip_sector_start + 1)
-    refill_block = trip_block1[1:]  # partendo dal byte 1
-    refill_machine_id = bytes_to_int_le(refill_block[0:2])
-    last_refill_timestamp = bytes_to_int_le(refill_block[2:6])
-    last_refill_amount = bytes_to_int_le(refill_block[6:10])
-    last_refill_amount_rub = last_refill_amount // 100
-    last_refill_amount_kop = last_refill_amount % 100
-    refill_counter = bytes_to_int_le(refill_block[10:12])
-    last_refill_dt = timestamp_to_datetime(last_refill_timestamp)
+    (refill_machine_id, last_refill_timestamp, last_refill_amount,
+     refill_counter) = REFILL_LAYOUT.unpack_from(dump, (trip_sector_start + 1) * BLOCK_SIZE + 1)
 
     # Blocco 2 del settore TRIP: trip block
-    trip_block2 = get_block(dump, trip_sector_start + 2)
-    # Validator first letter: 1 byte (little-endian, ma basta l'intero) a partire dal byte 1
-    validator_first_letter = chr(bytes_to_int_le(trip_block2[1:2]) & 0xFF)
-    # Validator id: 3 byte in BCD a partire dal byte 2
-    validator_id = bcd_to_int(trip_block2[2:5])
-    last_trip_timestamp = bytes_to_int_le(trip_block2[6:10])
-    track_number = bytes_to_int_le(trip_block2[10:11])
-    prev_balance = bytes_to_int_le(trip_block2[11:15])
-    prev_balance_rub = prev_balance // 100
-    prev_balance_kop = prev_balance % 100
-    last_trip_dt = timestamp_to_datetime(last_trip_timestamp)
+    # Validator first letter (byte 1), validator id (3 byte BCD dal byte 2), timestamp,
+    # track number e saldo precedente
+    (validator_letter, validator_bcd, last_trip_timestamp, track_number,
+     prev_balance) = TRIP_LAYOUT.unpack_from(dump, (trip_sector_start + 2) * BLOCK_SIZE)
+    validator_id = bcd_to_int(validator_bcd)
 
     # PURSE SECTOR: Settore 6
     purse_sector_start = mf_classic_first_block_of_sector(PURSE_SECTOR)
-    purse_block0 = get_block(dump, purse_sector_start)
-    balance_val = bytes_to_int_le(purse_block0[0:4])
-    balance_rub = balance_val // 100
-    balance_kop = balance_val % 100
+    (balance_val,) = PURSE_LAYOUT.unpack_from(dump, purse_sector_start * BLOCK_SIZE)
+
+    return ZolotayaKoronaRecord(
+        region_number, card_number_prefix, card_number_postfix,
+        status, sequence_number, discount_code,
+        refill_machine_id, last_refill_timestamp, last_refill_amount, refill_counter,
+        validator_letter, validator_id, last_trip_timestamp, track_number, prev_balance,
+        balance_val,
+    )
+
+# Parser principale
+def zolotaya_korona_parse(dump: bytes) -> str:
+    # Controlla che il dump sia sufficientemente lungo
+    if len(dump) < TOTAL_BLOCKS * BLOCK_SIZE:
+        return "Errore: dump troppo corto."
+    dump = memoryview(dump)
+
+    # INFO SECTOR: Il settore 15
+    # I 24 byte della signature (16 nel primo blocco, 8 nel secondo) sono confrontati in un colpo solo
+    if dump[INFO_SIGNATURE_OFFSET:INFO_SIGNATURE_END] != INFO_SECTOR_SIGNATURE:
+        # Solo in caso di errore si individua il blocco che non corrisponde
+        if dump[INFO_SIGNATURE_OFFSET:INFO_SIGNATURE_OFFSET + BLOCK_SIZE] != INFO_SECTOR_SIGNATURE[:BLOCK_SIZE]:
+            return "Errore: signature info settore non verificata (primo blocco)."
+        return "Errore: signature info settore non verificata (secondo blocco)."
+
+    # Se la signature è verificata, prosegui con il parsing.
+    record = decode_zolotaya_korona(dump)
+    last_refill_amount_rub, last_refill_amount_kop = divmod(record.last_refill_amount, 100)
+    prev_balance_rub, prev_balance_kop = divmod(record.prev_balance, 100)
+    balance_rub, balance_kop = divmod(record.balance, 100)
+    validator_first_letter = chr(record.validator_letter)
 
     # Per la formattazione delle date, assumiamo il formato DMY con separatore "."
     separator = "."
 
-    expiry_date_str = format_date(last_refill_dt, separator)  # utilizziamo last_refill_dt come esempio
-    last_trip_date_str = format_date(last_trip_dt, separator)
-    last_refill_time_str = last_refill_dt.strftime("%H:%M")
-    last_trip_time_str = last_trip_dt.strftime("%H:%M")
+    # utilizziamo la data dell'ultima ricarica come esempio di scadenza
+    expiry_date_str, last_refill_time_str = format_timestamp(record.last_refill_timestamp, separator)
+    last_trip_date_str, last_trip_time_str = format_timestamp(record.last_trip_timestamp, separator)
 
     # Costruzione dell’output:
     # Il numero della carta è composto da card_number_prefix e card_number_postfix.
-    output = []
-    output.append("Zolotaya korona")
-    output.append(f"Card number: {card_number_prefix}{card_number_postfix:015d}")
-    output.append(f"Region: {region_number}")
-    output.append(f"Balance: {balance_rub}.{balance_kop:02d} RUR")
-    output.append(f"Prev. balance: {prev_balance_rub}.{prev_balance_kop:02d} RUR")
-    output.append(f"Last refill amount: {last_refill_amount_rub}.{last_refill_amount_kop:02d} RUR")
-    output.append(f"Refill counter: {refill_counter}")
-    output.append(f"Last refill: {expiry_date_str} at {last_refill_time_str}")
-    output.append(f"Refill machine id: {refill_machine_id}")
-    output.append(f"Last trip: {last_trip_date_str} at {last_trip_time_str}")
-    output.append(f"Track number: {track_number}")
-    output.append(f"Validator: {validator_first_letter}{validator_id:06d}")
+    output = (
+        "Zolotaya korona\n"
+        f"Card number: {record.card_number_prefix}{record.card_number_postfix:015d}\n"
+        f"Region: {record.region_number}\n"
+        f"Balance: {balance_rub}.{TWO_DIGITS[balance_kop]} RUR\n"
+        f"Prev. balance: {prev_balance_rub}.{TWO_DIGITS[prev_balance_kop]} RUR\n"
+        f"Last refill amount: {last_refill_amount_rub}.{TWO_DIGITS[last_refill_amount_kop]} RUR\n"
+        f"Refill counter: {record.refill_counter}\n"
+        f"Last refill: {expiry_date_str} at {last_refill_time_str}\n"
+        f"Refill machine id: {record.refill_machine_id}\n"
+        f"Last trip: {last_trip_date_str} at {last_trip_time_str}\n"
+        f"Track number: {record.track_number}\n"
+        f"Validator: {validator_first_letter}{record.validator_id:06d}"
+    )
     # Se fosse abilitato il flag debug (qui assumiamo False) si stamperebbero anche status, sequence_number, discount_code.
-    return "\n".join(output)
+    return output
+
+def zolotaya_korona_parse_batch(dumps: bytes, dump_size: int = TOTAL_BLOCKS * BLOCK_SIZE) -> list:
+    """
+    Decodifica più dump concatenati nello stesso buffer (dump_size byte ciascuno).
+    Ogni dump è passato al parser come slice di un memoryview, senza copie.
+    """
+    mv = memoryview(dumps)
+    return [zolotaya_korona_parse(mv[start:start + dump_size])
+            for start in range(0, len(mv) - dump_size + 1, dump_size)]
 
 def main():
     if len(sys.argv) != 2:
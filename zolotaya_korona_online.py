@@ -1,53 +1,48 @@
 #!/usr/bin/env python3
 import sys
+import struct
 
 # Costanti
 BLOCK_SIZE = 16
 # Settori (per una carta 1K, ogni settore ha 4 blocchi)
 TRIP_SECTOR_NUM = 4
 INFO_SECTOR_NUM = 15
-
-def get_block(data: bytes, block_num: int) -> bytes:
-    """Restituisce il blocco (16 byte) identificato da block_num."""
-    start = block_num * BLOCK_SIZE
-    return data[start:start+BLOCK_SIZE]
-
-def bytes_to_int_be(b: bytes) -> int:
-    """Converte una sequenza di byte in intero (big-endian)."""
-    return int.from_bytes(b, byteorder='big')
+# Offset in byte del primo blocco dei settori usati (per 1K, settore * 4 blocchi)
+INFO_BLOCK_OFFSET = INFO_SECTOR_NUM * 4 * BLOCK_SIZE
+TRIP_BLOCK_OFFSET = TRIP_SECTOR_NUM * 4 * BLOCK_SIZE
+# Tariffario: u16 big-endian dal byte 1 del blocco INFO
+TARIFF_LAYOUT = struct.Struct(">H")
 
 def bcd_to_int(b: bytes) -> (int, bool):
     """
     Converte una sequenza di byte in formato BCD in un intero.
     Restituisce una tupla (valore, valid) in cui valid è True se tutti i nibble sono ≤ 9.
     """
-    total = 0
-    for byte in b:
-        high = (byte >> 4) & 0x0F
-        low = byte & 0x0F
-        if high > 9 or low > 9:
-            return (0, False)
-        total = total * 100 + high * 10 + low
-    return (total, True)
+    # La rappresentazione esadecimale di un BCD valido è già la stringa delle cifre (conversione in C)
+    digits = b.hex()
+    if digits.isdigit():
+        return (int(digits), True)
+    # Sequenza vuota (valore 0, valida) oppure almeno un nibble > 9
+    return (0, not digits)
+
+# Rappresentazione esadecimale a due cifre di ogni byte
+TWO_HEX = tuple(f"{i:02X}" for i in range(256))
+
+# Nomi dei tariffari indicizzati per valore a 16 bit
+ONLINE_CARD_TARIFFS = {
+    0x0100: "Standart (online)",
+    0x0101: "Standart (airtag)",
+    0x0121: "Standart (airtag)",
+    0x0401: "Student (50% discount)",
+    0x0402: "Student (travel)",
+    0x0002: "School (50% discount)",
+    0x0505: "Social (large families)",
+    0x0528: "Social (handicapped)",
+}
 
 def parse_online_card_tariff(tariff: int) -> str:
     """Ritorna il nome del tariffario in base al valore a 16 bit."""
-    if tariff == 0x0100:
-        return "Standart (online)"
-    elif tariff in (0x0101, 0x0121):
-        return "Standart (airtag)"
-    elif tariff == 0x0401:
-        return "Student (50% discount)"
-    elif tariff == 0x0402:
-        return "Student (travel)"
-    elif tariff == 0x0002:
-        return "School (50% discount)"
-    elif tariff == 0x0505:
-        return "Social (large families)"
-    elif tariff == 0x0528:
-        return "Social (handicapped)"
-    else:
-        return "Unknown"
+    return ONLINE_CARD_TARIFFS.get(tariff, "Unknown")
 
 def zolotaya_korona_online_parse(dump: bytes) -> str:
     """
@@ -58,14 +53,11 @@ def zolotaya_korona_online_parse(dump: bytes) -> str:
       - Dal settore TRIP (settore 4, blocco 16) legge un byte come region number.
       - L'output viene formattato in una stringa multilinea.
     """
-    # Calcola il numero del primo blocco di un settore (per 1K, settore * 4)
-    def first_block_of_sector(sector: int) -> int:
-        return sector * 4
+    dump = memoryview(dump)
 
     # INFO SECTOR: Settore 15
-    start_info_block = first_block_of_sector(INFO_SECTOR_NUM)
-    block_info = get_block(dump, start_info_block)
-    
+    block_info = dump[INFO_BLOCK_OFFSET:INFO_BLOCK_OFFSET + BLOCK_SIZE]
+
     # A partire dall'offset 3, leggi 2 byte BCD per il prefisso
     prefix_bcd = block_info[3:5]
     card_number_prefix, valid = bcd_to_int(prefix_bcd)
@@ -79,13 +71,11 @@ def zolotaya_korona_online_parse(dump: bytes) -> str:
     card_number_postfix //= 10
 
     # Tariffario: dal blocco INFO, a partire dall'offset 1, leggi 2 byte in BE
-    tariff_bytes = block_info[1:3]
-    tariff = bytes_to_int_be(tariff_bytes)
+    (tariff,) = TARIFF_LAYOUT.unpack_from(block_info, 1)
     tariff_name = parse_online_card_tariff(tariff)
 
     # TRIP SECTOR: Settore 4
-    start_trip_block = first_block_of_sector(TRIP_SECTOR_NUM)
-    block_trip = get_block(dump, start_trip_block)
+    block_trip = dump[TRIP_BLOCK_OFFSET:TRIP_BLOCK_OFFSET + BLOCK_SIZE]
     # Leggi 1 byte (offset 0) come region number
     region_number = block_trip[0]
 
@@ -95,7 +85,7 @@ def zolotaya_korona_online_parse(dump: bytes) -> str:
     output = (
         "Zolotaya korona\n"
         f"Card number: {card_number_prefix}{card_number_postfix:015d}\n"
-        f"Tariff: {tariff // 256:02X}.{tariff % 256:02X}: {tariff_name}\n"
+        f"Tariff: {TWO_HEX[tariff >> 8]}.{TWO_HEX[tariff & 0xFF]}: {tariff_name}\n"
         f"Region: {region_number}\n"
     )
     return output